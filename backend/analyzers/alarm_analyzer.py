@@ -8,10 +8,18 @@ from typing import Any, Dict, List
 
 from engine.alarm_analyzer import (  # type: ignore
     parse_alarm_file,
+    parse_alarm_files,
     summarize_alarms,
+    summarize_alarm_file,
     alarms_to_dicts,
 )
 
-__all__ = ["parse_alarm_file", "summarize_alarms", "alarms_to_dicts"]
+__all__ = [
+    "parse_alarm_file",
+    "parse_alarm_files",
+    "summarize_alarms",
+    "summarize_alarm_file",
+    "alarms_to_dicts",
+]
 
 
@@ -8,9 +8,16 @@ from typing import Any, Dict, List
 
 from engine.attach_analyzer import (  # type: ignore
     parse_attach_csv,
+    parse_attach_csvs,
     summarize_attach,
+    summarize_attach_file,
 )
 
-__all__ = ["parse_attach_csv", "summarize_attach"]
+__all__ = [
+    "parse_attach_csv",
+    "parse_attach_csvs",
+    "summarize_attach",
+    "summarize_attach_file",
+]
 
 
@@ -8,9 +8,16 @@ from typing import Any, Dict, List
 
 from engine.backhaul_analyzer import (  # type: ignore
     parse_backhaul_csv,
+    parse_backhaul_csvs,
     summarize_backhaul,
+    summarize_backhaul_file,
 )
 
-__all__ = ["parse_backhaul_csv", "summarize_backhaul"]
+__all__ = [
+    "parse_backhaul_csv",
+    "parse_backhaul_csvs",
+    "summarize_backhaul",
+    "summarize_backhaul_file",
+]
 
 
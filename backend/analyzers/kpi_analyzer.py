@@ -7,9 +7,24 @@ module so other backend components can depend on `backend.analyzers`.
 
 from typing import Any, Dict, List, Tuple
 
-from engine.kpi_analyzer import summarize_kpis  # type: ignore
-
-__all__ = ["summarize_kpis"]
+from engine.kpi_analyzer import (  # type: ignore
+    Anomaly,
+    kpi_frame,
+    summarize_kpis,
+    summarize_kpis_by_site,
+    summarize_kpis_df,
+)
+from engine.kpi_state import KpiRingBuffer, KpiState  # type: ignore
+
+__all__ = [
+    "Anomaly",
+    "KpiRingBuffer",
+    "KpiState",
+    "kpi_frame",
+    "summarize_kpis",
+    "summarize_kpis_by_site",
+    "summarize_kpis_df",
+]
 
 
 def analyze_kpis(kpi_data: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, float]], List[Dict[str, Any]], Dict[str, Dict[str, List[float]]]]:
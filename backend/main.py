@@ -1,6 +1,6 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 import sys
 import os
 from pathlib import Path
@@ -41,9 +41,9 @@ from ai.gpt_summary import generate_ai_summary
 from ai.anomaly_detector import detect_anomalies, prepare_hourly_data
 from ai.drift_detector import detect_drift
 from ai.nlq import answer_question
-from backend.analyzers.alarm_analyzer import parse_alarm_file, summarize_alarms, alarms_to_dicts
-from backend.analyzers.backhaul_analyzer import parse_backhaul_csv, summarize_backhaul
-from backend.analyzers.attach_analyzer import parse_attach_csv, summarize_attach
+from backend.analyzers.alarm_analyzer import summarize_alarm_file
+from backend.analyzers.backhaul_analyzer import summarize_backhaul_file
+from backend.analyzers.attach_analyzer import summarize_attach_file
 from backend.services.pdf_generator import generate_incident_report_pdf
 from backend.services.correlation_engine import (
     describe_kpi_alarm_correlation,
@@ -51,7 +51,12 @@ from backend.services.correlation_engine import (
     describe_attach_failures_correlation,
 )
 
-app = FastAPI(title="LTE Band 41 RCA API", version="1.0.0")
+# orjson renders the large KPI/RCA payloads several times faster than json
+app = FastAPI(
+    title="LTE Band 41 RCA API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # CORS configuration
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
@@ -101,9 +106,9 @@ class AlarmSummaryResponse(BaseModel):
 class BackhaulSummaryResponse(BaseModel):
     total_samples: int
     impairment_score: float
-    modulation_trend: List[Dict[str, Any]]
-    rssi_trend: List[Dict[str, Any]]
-    latency_jitter_trend: List[Dict[str, Any]]
+    modulation_trend: Dict[str, List[Any]]
+    rssi_trend: Dict[str, List[Any]]
+    latency_jitter_trend: Dict[str, List[Any]]
     error_summary: Dict[str, float]
 
 
@@ -287,8 +292,8 @@ async def upload_alarms(file: UploadFile = File(...)):
         if not content:
             raise HTTPException(status_code=400, detail="File is empty")
 
-        records = parse_alarm_file(content, file.filename)
-        summary = summarize_alarms(records)
+        # Identical re-uploads are served from the content-hash cache
+        summary = summarize_alarm_file(content, file.filename)
 
         # Store for subsequent RCA runs (single-user/session-oriented usage)
         global LATEST_ALARM_SUMMARY
@@ -314,8 +319,7 @@ async def upload_backhaul(file: UploadFile = File(...)):
         if not content:
             raise HTTPException(status_code=400, detail="File is empty")
 
-        samples = parse_backhaul_csv(content)
-        summary = summarize_backhaul(samples)
+        summary = summarize_backhaul_file(content)
 
         global LATEST_BACKHAUL_SUMMARY
         LATEST_BACKHAUL_SUMMARY = summary
@@ -340,8 +344,7 @@ async def upload_attach_logs(file: UploadFile = File(...)):
         if not content:
             raise HTTPException(status_code=400, detail="File is empty")
 
-        records = parse_attach_csv(content)
-        summary = summarize_attach(records)
+        summary = summarize_attach_file(content)
 
         global LATEST_ATTACH_SUMMARY
         LATEST_ATTACH_SUMMARY = summary
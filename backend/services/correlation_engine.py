@@ -26,8 +26,10 @@ def describe_kpi_backhaul_correlation(
 
     statements: List[str] = []
 
-    has_bler = any("BLER" in a.get("kpi", "") for a in kpi_anomalies)
-    has_erab = any("ERAB" in a.get("kpi", "") for a in kpi_anomalies)
+    # Scan the anomaly list once; large PM runs repeat the same few KPI names
+    kpis = {a.get("kpi", "") for a in kpi_anomalies}
+    has_bler = any("BLER" in k for k in kpis)
+    has_erab = any("ERAB" in k for k in kpis)
 
     if has_bler:
         statements.append(
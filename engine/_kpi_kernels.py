@@ -0,0 +1,49 @@
+"""
+Numeric kernels for KPI aggregation.
+
+Per-KPI statistics are computed from flat float64 values plus integer group
+codes. Counts, means and sums of squares come from ``np.bincount``; order
+statistics (min/max/median) come from one stable sort shared by every group.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+def _grouped_moments(
+    values: np.ndarray, codes: np.ndarray, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    count = np.bincount(codes, minlength=n_groups)
+    mean = np.bincount(codes, weights=values, minlength=n_groups) / count
+    dev = values - mean[codes]
+    m2 = np.bincount(codes, weights=dev * dev, minlength=n_groups)
+    return count, mean, m2
+
+
+def grouped_stats(
+    values: np.ndarray, codes: np.ndarray, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute per-group count, mean, min, max, median and sample stdev.
+
+    ``codes`` must be int64 in ``range(n_groups)`` with every group present.
+    stdev is NaN for groups with a single value.
+    """
+    count, mean, m2 = _grouped_moments(values, codes, n_groups)
+
+    # Sort by (group, value) once; each group is then a contiguous run
+    sorted_values = values[np.lexsort((values, codes))]
+    start = np.cumsum(count) - count
+    lo = sorted_values[start]
+    hi = sorted_values[start + count - 1]
+    median = (sorted_values[start + (count - 1) // 2] + sorted_values[start + count // 2]) / 2.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stdev = np.sqrt(m2 / (count - 1))
+    stdev[count < 2] = np.nan
+
+    return count, mean, lo, hi, median, stdev
+
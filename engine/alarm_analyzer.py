@@ -2,7 +2,7 @@
 Alarm analyzer for RAN-Copilot.
 
 Parses ENM/FM alarm logs from XML, CSV, or plain-text formats and produces:
-- normalized alarm records
+- a normalized alarm table (one pandas column per AlarmRecord field)
 - summary statistics (by severity, site/MO, alarm type, time bucket)
 
 This module is intentionally tolerant of multiple Ericsson FM export formats.
@@ -10,19 +10,25 @@ This module is intentionally tolerant of multiple Ericsson FM export formats.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-import csv
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import io
 import re
-import xml.etree.ElementTree as ET
+import sys
+
+import pandas as pd
+from lxml import etree
+
+from .cache import DigestCache, content_digest, map_in_pool
+from .csv_utils import coalesce, read_csv_frame
 
 
 SEVERITY_ORDER = ["CRITICAL", "MAJOR", "MINOR", "WARNING", "INDETERMINATE", "CLEARED", "INFO"]
 
 
-@dataclass
+@dataclass(slots=True)
 class AlarmRecord:
     timestamp: str
     severity: str
@@ -32,31 +38,96 @@ class AlarmRecord:
     additional_text: str
 
 
+# Column layout of the DataFrames returned by the parsers
+ALARM_COLUMNS = [f.name for f in fields(AlarmRecord)]
+
+# Parsers that walk alarms one at a time (XML, text) collect plain tuples in
+# ALARM_COLUMNS order rather than one AlarmRecord per alarm; pandas converts
+# the row list to columns in a single native pass.
+_AlarmRow = Tuple[str, str, str, str, str, str]
+
+# One alarm per (stripped) line of a pasted text log, e.g.:
+# 2025-01-01 12:00:00 CRITICAL ERBS-41001/Cell-1 ALARM_ID=1234 Text...
+# Separators exclude newlines so a match never spans two log lines.
+_TEXT_LINE_RE = re.compile(
+    r"^(?P<ts>\d{4}[-/]\d{2}[-/]\d{2}[ T]\d{2}:\d{2}:\d{2})[^\S\n]+"
+    r"(?P<sev>\w+)[^\S\n]+"
+    r"(?P<mo>\S+)[^\S\n]+"
+    # rest is the whole remainder; aid captures the first ALARM_ID=/id= token in it
+    r"(?P<rest>(?=.)(?:.*?(?i:ALARM_ID|alarmId|id)=(?P<aid>\S+))?.*)$",
+    re.MULTILINE,
+)
+
+
+# Common Ericsson severities
+_SEVERITY_ALIASES = {
+    "CRIT": "CRITICAL",
+    "MAJ": "MAJOR",
+    "MIN": "MINOR",
+    "WARN": "WARNING",
+    "INDET": "INDETERMINATE",
+    "CLEARED": "CLEARED",
+    "CLEAR": "CLEARED",
+    "INFO": "INFO",
+}
+
+_UNKNOWN = sys.intern("UNKNOWN")
+
+_SUMMARY_CACHE = DigestCache(maxsize=16)
+
+# Normalised CSV headers read by _parse_alarm_csv; other columns are skipped
+_CSV_COLUMNS = frozenset(
+    {
+        "severity", "perceivedseverity",
+        "alarmtype", "alarmclass", "probablecause",
+        "mo", "managedobject", "objectofreference",
+        "timestamp", "eventtime", "raisedtime",
+        "alarmid", "notificationid",
+        "additionaltext", "additionalinformation", "description",
+    }
+)
+
+
+@lru_cache(maxsize=64)
 def _normalise_severity(value: str) -> str:
+    # Only a handful of distinct severities occur, so results are memoised
+    # and every record shares the same string object per severity.
     if not value:
         return "INDETERMINATE"
     v = value.strip().upper()
-    # Common Ericsson severities
-    mapping = {
-        "CRIT": "CRITICAL",
-        "MAJ": "MAJOR",
-        "MIN": "MINOR",
-        "WARN": "WARNING",
-        "INDET": "INDETERMINATE",
-        "CLEARED": "CLEARED",
-        "CLEAR": "CLEARED",
-        "INFO": "INFO",
-    }
-    return mapping.get(v, v)
+    return sys.intern(_SEVERITY_ALIASES.get(v, v))
 
 
 def _parse_timestamp(value: str) -> str:
     if not value:
         return datetime.utcnow().isoformat()
+    parsed = _parse_timestamp_cached(value)
+    # Fallback: unparseable timestamps are stamped with the current time
+    return parsed if parsed is not None else datetime.utcnow().isoformat()
+
+
+@lru_cache(maxsize=100_000)
+def _parse_timestamp_cached(value: str) -> Optional[str]:
+    """
+    Parse a raw timestamp into a naive ISO-8601 string, or None.
+
+    Bulk FM exports repeat the same timestamps heavily, so results are
+    memoised. Only successful parses are meaningful to cache; the
+    "current time" fallback is applied by the caller.
+    """
     value = value.strip()
     # Strip trailing Z
     if value.endswith("Z"):
         value = value[:-1]
+    # Fast path: C-implemented ISO-8601 parser
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    else:
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt.isoformat()
     formats = [
         "%Y-%m-%dT%H:%M:%S",
         "%Y-%m-%dT%H:%M:%S.%f",
@@ -68,13 +139,15 @@ def _parse_timestamp(value: str) -> str:
             return datetime.strptime(value, fmt).isoformat()
         except ValueError:
             continue
-    # Fallback: return as-is
-    return datetime.utcnow().isoformat()
+    return None
 
 
-def parse_alarm_file(content: bytes, filename: str) -> List[AlarmRecord]:
+def parse_alarm_file(content: bytes, filename: str) -> pd.DataFrame:
     """
-    Parse an alarm file (XML, CSV, or text) into normalized AlarmRecord objects.
+    Parse an alarm file (XML, CSV, or text) into a normalized alarm DataFrame.
+
+    The frame has one column per AlarmRecord field (see ALARM_COLUMNS) so
+    summaries can work column-wise instead of per record.
     """
     name = filename.lower()
     if name.endswith(".xml"):
@@ -85,173 +158,178 @@ def parse_alarm_file(content: bytes, filename: str) -> List[AlarmRecord]:
     return _parse_alarm_text(content.decode(errors="ignore"))
 
 
-def _parse_alarm_xml(content: bytes) -> List[AlarmRecord]:
-    records: List[AlarmRecord] = []
-    try:
-        root = ET.fromstring(content)
-    except ET.ParseError:
-        return records
-
-    # Ericsson FM exports often use "alarm" or "notification" elements
-    for elem in root.iter():
-        tag = elem.tag.split("}")[-1]
-        if tag not in {"alarm", "notification", "fault"}:
-            continue
-
-        # Try common field names
-        severity = (
-            _get_text(elem, "perceivedSeverity")
-            or _get_text(elem, "severity")
-            or _get_text(elem, "severityText")
-        )
-        alarm_type = (
-            _get_text(elem, "alarmType")
-            or _get_text(elem, "probableCause")
-            or _get_text(elem, "specificProblem")
-        )
-        mo = (
-            _get_text(elem, "managedObject")
-            or _get_text(elem, "managedObjectInstance")
-            or _get_text(elem, "objectOfReference")
-            or _get_attr(elem, "mo")
-        )
-        timestamp = (
-            _get_text(elem, "eventTime")
-            or _get_text(elem, "raisedTime")
-            or _get_text(elem, "time")
-        )
-        alarm_id = (
-            _get_text(elem, "alarmId")
-            or _get_text(elem, "notificationId")
-            or _get_attr(elem, "id")
-        )
-        additional_text = (
-            _get_text(elem, "additionalText")
-            or _get_text(elem, "additionalInformation")
-            or _get_text(elem, "description")
-        )
-
-        rec = AlarmRecord(
-            timestamp=_parse_timestamp(timestamp),
-            severity=_normalise_severity(severity or ""),
-            alarm_type=(alarm_type or "UNKNOWN"),
-            mo=(mo or "UNKNOWN"),
-            alarm_id=(alarm_id or ""),
-            additional_text=(additional_text or ""),
-        )
-        records.append(rec)
-
-    return records
-
-
-def _parse_alarm_csv(content: bytes) -> List[AlarmRecord]:
-    records: List[AlarmRecord] = []
-    text = content.decode(errors="ignore")
-    reader = csv.DictReader(io.StringIO(text))
+def parse_alarm_files(
+    items: Iterable[Tuple[bytes, str]], max_workers: Optional[int] = None
+) -> List[pd.DataFrame]:
+    """Parse a batch of (content, filename) alarm files in worker processes, in input order."""
+    items = list(items)
+    return map_in_pool(
+        parse_alarm_file, [c for c, _ in items], [f for _, f in items], max_workers=max_workers
+    )
 
-    # Normalise column names
-    def norm(s: str) -> str:
-        return s.strip().lower().replace(" ", "").replace("_", "")
 
-    for row in reader:
-        if not row:
-            continue
+def _parse_alarm_xml(content: bytes) -> pd.DataFrame:
+    # One slot per alarm-like element, reserved at its start tag so records
+    # stay in document order even when such elements are nested
+    rows: List[Optional[_AlarmRow]] = []
+    open_slots: List[int] = []
+
+    # Stream the document and only materialise alarm-like elements; each
+    # outermost one is cleared once processed so peak memory stays bounded.
+    events = etree.iterparse(
+        io.BytesIO(content),
+        events=("start", "end"),
+        # Ericsson FM exports often use "alarm" or "notification" elements
+        tag=("{*}alarm", "{*}notification", "{*}fault"),
+        resolve_entities=False,
+    )
+    try:
+        for event, elem in events:
+            if event == "start":
+                open_slots.append(len(rows))
+                rows.append(None)
+                continue
+
+            # Local-name -> text for all descendants (first occurrence wins),
+            # serving every field lookup below from one walk of the subtree
+            texts: Dict[str, str] = {}
+            for child in elem.iterdescendants():
+                if not isinstance(child.tag, str) or not child.text:
+                    continue
+                texts.setdefault(etree.QName(child).localname, child.text.strip())
+
+            # Try common field names
+            severity = (
+                texts.get("perceivedSeverity")
+                or texts.get("severity")
+                or texts.get("severityText")
+            )
+            alarm_type = (
+                texts.get("alarmType")
+                or texts.get("probableCause")
+                or texts.get("specificProblem")
+            )
+            mo = (
+                texts.get("managedObject")
+                or texts.get("managedObjectInstance")
+                or texts.get("objectOfReference")
+                or elem.get("mo")
+            )
+            timestamp = (
+                texts.get("eventTime")
+                or texts.get("raisedTime")
+                or texts.get("time")
+            )
+            alarm_id = (
+                texts.get("alarmId")
+                or texts.get("notificationId")
+                or elem.get("id")
+            )
+            additional_text = (
+                texts.get("additionalText")
+                or texts.get("additionalInformation")
+                or texts.get("description")
+            )
 
-        cols = {norm(k): v for k, v in row.items()}
-
-        severity = cols.get("severity") or cols.get("perceivedseverity") or ""
-        alarm_type = cols.get("alarmtype") or cols.get("alarmclass") or cols.get("probablecause") or ""
-        mo = cols.get("mo") or cols.get("managedobject") or cols.get("objectofreference") or ""
-        timestamp = cols.get("timestamp") or cols.get("eventtime") or cols.get("raisedtime") or ""
-        alarm_id = cols.get("alarmid") or cols.get("notificationid") or ""
-        additional_text = cols.get("additionaltext") or cols.get("additionalinformation") or cols.get("description") or ""
-
-        records.append(
-            AlarmRecord(
-                timestamp=_parse_timestamp(timestamp),
-                severity=_normalise_severity(severity),
-                alarm_type=alarm_type or "UNKNOWN",
-                mo=mo or "UNKNOWN",
-                alarm_id=alarm_id or "",
-                additional_text=additional_text or "",
+            rows[open_slots.pop()] = (
+                _parse_timestamp(timestamp),
+                _normalise_severity(severity or ""),
+                sys.intern(alarm_type) if alarm_type else _UNKNOWN,
+                sys.intern(mo) if mo else _UNKNOWN,
+                alarm_id or "",
+                additional_text or "",
             )
-        )
 
-    return records
+            # Nested elements are still part of an enclosing alarm's subtree;
+            # only prune once the outermost one has been read
+            if not open_slots:
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+    except etree.XMLSyntaxError:
+        # Keep whatever was parsed before the document became malformed
+        pass
+
+    return _rows_to_frame([row for row in rows if row is not None])
+
+
+def _parse_alarm_csv(content: bytes) -> pd.DataFrame:
+    df = read_csv_frame(content, columns=_CSV_COLUMNS)
+    if df.empty:
+        return _rows_to_frame([])
+
+    severity = coalesce(df, "severity", "perceivedseverity")
+    alarm_type = coalesce(df, "alarmtype", "alarmclass", "probablecause")
+    mo = coalesce(df, "mo", "managedobject", "objectofreference")
+    timestamp = coalesce(df, "timestamp", "eventtime", "raisedtime")
+    alarm_id = coalesce(df, "alarmid", "notificationid")
+    additional_text = coalesce(df, "additionaltext", "additionalinformation", "description")
+
+    return pd.DataFrame(
+        {
+            "timestamp": timestamp.map(_parse_timestamp),
+            "severity": severity.map(_normalise_severity),
+            "alarm_type": alarm_type.replace("", "UNKNOWN"),
+            "mo": mo.replace("", "UNKNOWN"),
+            "alarm_id": alarm_id,
+            "additional_text": additional_text,
+        },
+        columns=ALARM_COLUMNS,
+    )
 
 
-def _parse_alarm_text(text: str) -> List[AlarmRecord]:
+def _parse_alarm_text(text: str) -> pd.DataFrame:
     """
     Very tolerant line-based parser for pasted log snippets.
     Expects one alarm per line, tries to extract severity, timestamp, MO, and description.
-    """
-    records: List[AlarmRecord] = []
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-
-    # Example patterns:
-    # 2025-01-01 12:00:00 CRITICAL ERBS-41001/Cell-1 ALARM_ID=1234 Text...
-    pattern = re.compile(
-        r"^(?P<ts>\d{4}[-/]\d{2}[-/]\d{2}[ T]\d{2}:\d{2}:\d{2})\s+"
-        r"(?P<sev>\w+)\s+"
-        r"(?P<mo>\S+)\s+"
-        r"(?P<rest>.+)$"
-    )
 
-    for line in lines:
-        m = pattern.match(line)
-        if not m:
-            # If we cannot match, treat whole line as description
-            records.append(
-                AlarmRecord(
-                    timestamp=datetime.utcnow().isoformat(),
-                    severity="INDETERMINATE",
-                    alarm_type="TEXT_LOG",
-                    mo="UNKNOWN",
-                    alarm_id="",
-                    additional_text=line,
-                )
+    The cleaned log is scanned once with a multiline regex; lines falling in
+    the gaps between matches are kept as free-text alarms.
+    """
+    rows: List[_AlarmRow] = []
+    text = "\n".join(l.strip() for l in text.splitlines() if l.strip())
+
+    def add_unmatched(chunk: str) -> None:
+        # If we cannot match, treat whole line as description
+        for line in chunk.split("\n"):
+            if not line:
+                continue
+            rows.append(
+                (datetime.utcnow().isoformat(), "INDETERMINATE", "TEXT_LOG", "UNKNOWN", "", line)
             )
-            continue
 
-        ts = m.group("ts")
-        sev = m.group("sev")
-        mo = m.group("mo")
-        rest = m.group("rest")
+    pos = 0
+    for m in _TEXT_LINE_RE.finditer(text):
+        add_unmatched(text[pos:m.start()])
+        pos = m.end()
 
-        # Try to extract an alarm ID token
-        alarm_id_match = re.search(r"(ALARM_ID|alarmId|id)=(\S+)", rest, re.IGNORECASE)
-        alarm_id = alarm_id_match.group(2) if alarm_id_match else ""
-
-        records.append(
-            AlarmRecord(
-                timestamp=_parse_timestamp(ts),
-                severity=_normalise_severity(sev),
-                alarm_type="TEXT_LOG",
-                mo=mo,
-                alarm_id=alarm_id,
-                additional_text=rest,
+        rest = m.group("rest")
+        alarm_id = m.group("aid") or ""
+
+        rows.append(
+            (
+                _parse_timestamp(m.group("ts")),
+                _normalise_severity(m.group("sev")),
+                "TEXT_LOG",
+                sys.intern(m.group("mo")),
+                alarm_id,
+                rest,
             )
         )
+    add_unmatched(text[pos:])
 
-    return records
+    return _rows_to_frame(rows)
 
 
-def _get_text(elem: ET.Element, tag: str) -> Optional[str]:
-    child = elem.find(f".//{tag}")
-    if child is not None and child.text:
-        return child.text.strip()
-    return None
+def _rows_to_frame(rows: List[_AlarmRow]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=ALARM_COLUMNS)
 
 
-def _get_attr(elem: ET.Element, attr: str) -> Optional[str]:
-    return elem.attrib.get(attr)
-
-
-def summarize_alarms(records: List[AlarmRecord]) -> Dict[str, Any]:
+def summarize_alarms(alarms: pd.DataFrame) -> Dict[str, Any]:
     """
     Build summary statistics used by the Alarms dashboard and RCA engine.
     """
-    if not records:
+    if alarms.empty:
         return {
             "total_count": 0,
             "by_severity": {},
@@ -259,46 +337,43 @@ def summarize_alarms(records: List[AlarmRecord]) -> Dict[str, Any]:
             "timeline": [],
         }
 
-    by_severity: Dict[str, int] = {}
-    by_mo: Dict[str, int] = {}
-    timeline: Dict[str, int] = {}
-
-    for rec in records:
-        sev = rec.severity or "INDETERMINATE"
-        by_severity[sev] = by_severity.get(sev, 0) + 1
-
-        mo = rec.mo or "UNKNOWN"
-        by_mo[mo] = by_mo.get(mo, 0) + 1
-
-        # Bucket timeline by hour
-        try:
-            dt = datetime.fromisoformat(rec.timestamp)
-            bucket = dt.replace(minute=0, second=0, microsecond=0).isoformat()
-        except Exception:
-            bucket = rec.timestamp
-        timeline[bucket] = timeline.get(bucket, 0) + 1
-
+    severity = alarms["severity"].replace("", "INDETERMINATE")
+    by_severity = severity.value_counts().to_dict()
     # Order severities
     ordered_severity = {
         sev: by_severity[sev] for sev in SEVERITY_ORDER if sev in by_severity
     }
-    # Convert timeline dict to sorted list
+
+    mo = alarms["mo"].replace("", "UNKNOWN")
+    by_mo = mo.groupby(mo, sort=False).size().to_dict()
+
+    # Bucket timeline by hour. Parsers emit ISO-8601 strings, so truncating
+    # to "YYYY-MM-DDTHH" is equivalent to flooring a parsed datetime.
+    ts = alarms["timestamp"]
+    buckets = ts.where(ts.str.len() < 13, ts.str[:13] + ":00:00")
+    timeline = buckets.value_counts().sort_index()
     timeline_list = [
-        {"timestamp": ts, "count": count}
-        for ts, count in sorted(timeline.items(), key=lambda x: x[0])
+        {"timestamp": bucket, "count": count}
+        for bucket, count in zip(timeline.index.tolist(), timeline.tolist())
     ]
 
     return {
-        "total_count": len(records),
+        "total_count": len(alarms),
         "by_severity": ordered_severity,
         "by_mo": by_mo,
         "timeline": timeline_list,
-        "sample": [asdict(r) for r in records[:200]],  # cap for UI
+        "sample": alarms.head(200).to_dict("records"),  # cap for UI
     }
 
 
-def alarms_to_dicts(records: List[AlarmRecord]) -> List[Dict[str, Any]]:
-    """Helper to convert dataclass objects into plain dicts for JSON responses."""
-    return [asdict(r) for r in records]
+def alarms_to_dicts(alarms: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Helper to convert the alarm table into plain dicts for JSON responses."""
+    return alarms.to_dict("records")
 
 
+def summarize_alarm_file(content: bytes, filename: str) -> Dict[str, Any]:
+    """Parse and summarize an alarm upload, cached by content digest (do not mutate)."""
+    return _SUMMARY_CACHE.get_or_compute(
+        content_digest(content, filename.lower().encode()),
+        lambda: summarize_alarms(parse_alarm_file(content, filename)),
+    )
@@ -1,7 +1,7 @@
 """
 Attach log analyzer for RAN-Copilot.
 
-Parses attach/ERAB logs (typically CSV) and produces:
+Parses attach/ERAB logs (typically CSV) into a per-attempt DataFrame and produces:
 - per-IMSI attach success statistics
 - classification of dominant failure categories
 - simple trend data.
@@ -9,14 +9,32 @@ Parses attach/ERAB logs (typically CSV) and produces:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Tuple
-import csv
-import io
-from collections import defaultdict
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import re
 
+import numpy as np
+import pandas as pd
 
-@dataclass
+from .cache import DigestCache, content_digest, map_in_pool
+from .csv_utils import coalesce, read_csv_frame
+
+_SUMMARY_CACHE = DigestCache(maxsize=16)
+
+# Normalised CSV headers read by parse_attach_csv; other columns are skipped
+_CSV_COLUMNS = frozenset(
+    {
+        "imsi",
+        "apn",
+        "tac",
+        "attachrejectcause", "attachcause",
+        "erabsetupcause", "erabcause",
+        "failurecategory",
+    }
+)
+
+
+@dataclass(slots=True)
 class AttachRecord:
     imsi: str
     apn: str
@@ -26,63 +44,75 @@ class AttachRecord:
     failure_category: str  # APN_QCI, TAC, RF, Congestion, Other, or SUCCESS
 
 
-def parse_attach_csv(content: bytes) -> List[AttachRecord]:
-    text = content.decode(errors="ignore")
-    reader = csv.DictReader(io.StringIO(text))
-
-    def norm(s: str) -> str:
-        return s.strip().lower().replace(" ", "").replace("_", "")
-
-    records: List[AttachRecord] = []
-
-    for row in reader:
-        if not row:
-            continue
-
-        cols = {norm(k): v for k, v in row.items()}
-
-        imsi = cols.get("imsi", "").strip()
-        apn = cols.get("apn", "").strip()
-        tac = cols.get("tac", "").strip()
-        attach_cause = cols.get("attachrejectcause", cols.get("attach_cause", "")).strip()
-        erab_cause = cols.get("erabsetupcause", cols.get("erab_cause", "")).strip()
-        failure_cat = cols.get("failurecategory", "").strip()
-
-        # Normalize failure category if not explicitly provided
-        if not failure_cat:
-            failure_cat = classify_failure(attach_cause, erab_cause)
-
-        records.append(
-            AttachRecord(
-                imsi=imsi or "UNKNOWN",
-                apn=apn or "UNKNOWN",
-                tac=tac or "UNKNOWN",
-                attach_reject_cause=attach_cause,
-                erab_setup_cause=erab_cause,
-                failure_category=failure_cat,
-            )
-        )
-
-    return records
+# Column layout of the DataFrame returned by parse_attach_csv
+ATTACH_COLUMNS = [f.name for f in fields(AttachRecord)]
+
+
+def parse_attach_csv(content: bytes) -> pd.DataFrame:
+    df = read_csv_frame(content, columns=_CSV_COLUMNS)
+    if df.empty:
+        return pd.DataFrame(columns=ATTACH_COLUMNS)
+
+    imsi = coalesce(df, "imsi").str.strip()
+    apn = coalesce(df, "apn").str.strip()
+    tac = coalesce(df, "tac").str.strip()
+    attach_cause = coalesce(df, "attachrejectcause", "attachcause").str.strip()
+    erab_cause = coalesce(df, "erabsetupcause", "erabcause").str.strip()
+    failure_cat = coalesce(df, "failurecategory").str.strip()
+
+    return pd.DataFrame(
+        {
+            "imsi": imsi.replace("", "UNKNOWN"),
+            "apn": apn.replace("", "UNKNOWN"),
+            "tac": tac.replace("", "UNKNOWN"),
+            "attach_reject_cause": attach_cause,
+            "erab_setup_cause": erab_cause,
+            # Normalize failure category if not explicitly provided
+            "failure_category": [
+                cat or classify_failure(a, e)
+                for cat, a, e in zip(failure_cat, attach_cause, erab_cause)
+            ],
+        },
+        columns=ATTACH_COLUMNS,
+    )
+
+
+def parse_attach_csvs(
+    contents: Iterable[bytes], max_workers: Optional[int] = None
+) -> List[pd.DataFrame]:
+    """Parse a batch of attach CSV files in worker processes, in input order."""
+    return map_in_pool(parse_attach_csv, contents, max_workers=max_workers)
+
+
+# Keyword families in priority order. Each branch is a lookahead anchored at
+# the start of the text, so the first family with any hit wins regardless of
+# where in the text the keyword appears; m.lastgroup names the category.
+_FAILURE_KEYWORDS = [
+    ("APN_QCI", ["apn", "qci", "pdn", "service not subscribed"]),
+    ("TAC", ["tac", "tracking area", "roaming not allowed"]),
+    ("RF", ["radio", "rf", "coverage", "signal", "sinr"]),
+    ("Congestion", ["congestion", "resource unavailable", "no resource"]),
+]
+_FAILURE_RE = re.compile(
+    "^(?:"
+    + "|".join(
+        rf"(?=.*?(?:{'|'.join(map(re.escape, words))}))(?P<{category}>)"
+        for category, words in _FAILURE_KEYWORDS
+    )
+    + ")",
+    re.IGNORECASE | re.DOTALL,
+)
 
 
 def classify_failure(attach_cause: str, erab_cause: str) -> str:
-    text = f"{attach_cause} {erab_cause}".lower()
-    if not text.strip():
+    if not (attach_cause.strip() or erab_cause.strip()):
         return "SUCCESS"
-    if any(x in text for x in ["apn", "qci", "pdn", "service not subscribed"]):
-        return "APN_QCI"
-    if any(x in text for x in ["tac", "tracking area", "roaming not allowed"]):
-        return "TAC"
-    if any(x in text for x in ["radio", "rf", "coverage", "signal", "sinr"]):
-        return "RF"
-    if any(x in text for x in ["congestion", "resource unavailable", "no resource"]):
-        return "Congestion"
-    return "Other"
-
-
-def summarize_attach(records: List[AttachRecord]) -> Dict[str, Any]:
-    if not records:
+    m = _FAILURE_RE.match(f"{attach_cause} {erab_cause}")
+    return m.lastgroup if m else "Other"
+
+
+def summarize_attach(records: pd.DataFrame) -> Dict[str, Any]:
+    if records.empty:
         return {
             "overall_attach_success_rate": None,
             "per_imsi": {},
@@ -92,53 +122,39 @@ def summarize_attach(records: List[AttachRecord]) -> Dict[str, Any]:
             "dominant_failure_category": None,
         }
 
-    per_imsi_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"success": 0, "fail": 0})
-    per_apn_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"success": 0, "fail": 0})
-    per_tac_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"success": 0, "fail": 0})
-    failure_cats: Dict[str, int] = defaultdict(int)
-
-    total = 0
-    success = 0
-
-    for rec in records:
-        total += 1
-        is_success = rec.failure_category == "SUCCESS"
-        if is_success:
-            success += 1
-
-        key = "success" if is_success else "fail"
-        per_imsi_counts[rec.imsi][key] += 1
-        per_apn_counts[rec.apn][key] += 1
-        per_tac_counts[rec.tac][key] += 1
-
-        if not is_success:
-            failure_cats[rec.failure_category] += 1
+    categories = records["failure_category"]
+    is_success = categories.to_numpy() == "SUCCESS"
+    overall_rate = int(is_success.sum()) / len(is_success) * 100.0
 
-    overall_rate = (success / total) * 100.0 if total > 0 else None
+    # One int8 success flag per attempt, aggregated by each dimension in C
+    flags = pd.Series(is_success.astype(np.int8), index=records.index)
 
-    def to_rate_dict(counter: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, Any]]:
-        out: Dict[str, Dict[str, Any]] = {}
-        for k, val in counter.items():
-            total_local = val["success"] + val["fail"]
-            rate = (val["success"] / total_local) * 100.0 if total_local > 0 else None
-            out[k] = {"success": val["success"], "fail": val["fail"], "success_rate": rate}
-        return out
+    def to_rate_dict(key: str) -> Dict[str, Dict[str, Any]]:
+        counts = flags.groupby(records[key], sort=False).agg(success="sum", total="size")
+        counts["fail"] = counts["total"] - counts["success"]
+        counts["success_rate"] = counts["success"] / counts["total"] * 100.0
+        return counts[["success", "fail", "success_rate"]].to_dict("index")
 
-    per_imsi = to_rate_dict(per_imsi_counts)
-    per_apn = to_rate_dict(per_apn_counts)
-    per_tac = to_rate_dict(per_tac_counts)
+    failure_cats = categories[~is_success].value_counts(sort=False)
 
+    # Counts are in first-seen order, so argmax breaks ties the same way
+    # Counter.most_common(1) does
     dominant_failure = None
-    if failure_cats:
-        dominant_failure = max(failure_cats.items(), key=lambda x: x[1])[0]
+    if not failure_cats.empty:
+        dominant_failure = failure_cats.index[failure_cats.to_numpy().argmax()]
 
     return {
         "overall_attach_success_rate": overall_rate,
-        "per_imsi": per_imsi,
-        "per_apn": per_apn,
-        "per_tac": per_tac,
-        "failure_categories": dict(failure_cats),
+        "per_imsi": to_rate_dict("imsi"),
+        "per_apn": to_rate_dict("apn"),
+        "per_tac": to_rate_dict("tac"),
+        "failure_categories": failure_cats.to_dict(),
         "dominant_failure_category": dominant_failure,
     }
 
 
+def summarize_attach_file(content: bytes) -> Dict[str, Any]:
+    """Parse and summarize an attach CSV upload, cached by content digest (do not mutate)."""
+    return _SUMMARY_CACHE.get_or_compute(
+        content_digest(content), lambda: summarize_attach(parse_attach_csv(content))
+    )
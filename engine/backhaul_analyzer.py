@@ -9,14 +9,35 @@ Parses microwave/fiber backhaul CSV logs and produces:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Any, Dict, List
-import csv
-import io
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cache import DigestCache, content_digest, map_in_pool
+from .csv_utils import coalesce, read_csv_frame
+
+# Summaries carry every sample in their trend lists, so their size grows with
+# the upload; keep only the last couple (re-submits of the same file)
+_SUMMARY_CACHE = DigestCache(maxsize=2)
+
+# Normalised CSV headers read by parse_backhaul_csv; other columns are skipped
+_CSV_COLUMNS = frozenset(
+    {
+        "timestamp", "time",
+        "modulation",
+        "rssi",
+        "latency", "latencyms",
+        "jitter", "jitterms",
+        "txerrors", "txerr",
+        "rxerrors", "rxerr",
+    }
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class BackhaulSample:
     timestamp: str
     modulation: float
@@ -27,6 +48,22 @@ class BackhaulSample:
     rx_errors: float
 
 
+# Column layout of the DataFrame returned by parse_backhaul_csv
+BACKHAUL_COLUMNS = [f.name for f in fields(BackhaulSample)]
+
+
+# Common microwave / LTE modulations
+_MOD_MAP: Dict[str, float] = {
+    "QPSK": 2.0,
+    "4QAM": 2.0,
+    "16QAM": 4.0,
+    "32QAM": 5.0,
+    "64QAM": 6.0,
+    "128QAM": 7.0,
+    "256QAM": 8.0,
+}
+
+
 def _modulation_to_order(raw: str) -> float:
     """
     Map textual modulation schemes (e.g. 'QPSK', '64QAM') to an ordinal value.
@@ -34,40 +71,24 @@ def _modulation_to_order(raw: str) -> float:
     """
     if raw is None:
         return 0.0
-    s = str(raw).strip().upper()
+    s = (raw if isinstance(raw, str) else str(raw)).strip().upper()
     if not s:
         return 0.0
 
-    # Common microwave / LTE modulations
-    mapping = {
-        "QPSK": 2.0,
-        "4QAM": 2.0,
-        "16QAM": 4.0,
-        "32QAM": 5.0,
-        "64QAM": 6.0,
-        "128QAM": 7.0,
-        "256QAM": 8.0,
-    }
-    if s in mapping:
-        return mapping[s]
-
-    # Try to strip trailing 'QAM' and parse numeric order
-    if s.endswith("QAM"):
-        prefix = s[:-3]
-        try:
-            order = float(prefix)
-            # Map constellation size N-QAM to an approximate order metric
-            return max(1.0, order / 16.0)
-        except ValueError:
-            pass
+    order = _MOD_MAP.get(s)
+    if order is not None:
+        return order
 
     try:
+        if s.endswith("QAM"):
+            # Map constellation size N-QAM to an approximate order metric
+            return max(1.0, float(s[:-3]) / 16.0)
         return float(s)
     except ValueError:
         return 0.0
 
 
-def parse_backhaul_csv(content: bytes) -> List[BackhaulSample]:
+def parse_backhaul_csv(content: bytes) -> pd.DataFrame:
     """
     Parse a backhaul CSV file with at least:
     - timestamp
@@ -75,116 +96,97 @@ def parse_backhaul_csv(content: bytes) -> List[BackhaulSample]:
     - RSSI
     - latency/jitter
     - TX/RX errors
+
+    Returns a DataFrame with one column per BackhaulSample field.
     """
-    text = content.decode(errors="ignore")
-    reader = csv.DictReader(io.StringIO(text))
-
-    samples: List[BackhaulSample] = []
-
-    def norm(name: str) -> str:
-        return name.strip().lower().replace(" ", "").replace("_", "")
-
-    for row in reader:
-        if not row:
-            continue
-        cols = {norm(k): v for k, v in row.items()}
-
-        ts = cols.get("timestamp") or cols.get("time") or ""
-        modulation_raw = cols.get("modulation", "") or ""
-        modulation = _modulation_to_order(modulation_raw)
-
-        def to_float(key: str, *aliases: str) -> float:
-            for k in (key, *aliases):
-                if k in cols and cols[k] not in (None, ""):
-                    try:
-                        return float(str(cols[k]).strip())
-                    except ValueError:
-                        return 0.0
-            return 0.0
-
-        rssi = to_float("rssi")
-        latency = to_float("latency", "latencyms")
-        jitter = to_float("jitter", "jitterms")
-        tx_err = to_float("txerrors", "tx_err")
-        rx_err = to_float("rxerrors", "rx_err")
-
-        if not ts:
-            ts = datetime.utcnow().isoformat()
-
-        samples.append(
-            BackhaulSample(
-                timestamp=ts,
-                modulation=modulation,
-                rssi=rssi,
-                latency_ms=latency,
-                jitter_ms=jitter,
-                tx_errors=tx_err,
-                rx_errors=rx_err,
-            )
-        )
-
-    return samples
-
-
-def summarize_backhaul(samples: List[BackhaulSample]) -> Dict[str, Any]:
+    df = read_csv_frame(content, columns=_CSV_COLUMNS)
+    if df.empty:
+        return pd.DataFrame(columns=BACKHAUL_COLUMNS)
+
+    def to_float(*names: str) -> pd.Series:
+        values = pd.to_numeric(coalesce(df, *names).str.strip(), errors="coerce")
+        return values.fillna(0.0).astype(float)
+
+    ts = coalesce(df, "timestamp", "time").replace("", datetime.utcnow().isoformat())
+
+    # Few distinct modulation labels appear per link, so map each one once
+    modulation_raw = coalesce(df, "modulation")
+    modulation = modulation_raw.map(
+        {raw: _modulation_to_order(raw) for raw in modulation_raw.unique()}
+    )
+
+    return pd.DataFrame(
+        {
+            "timestamp": ts,
+            "modulation": modulation.astype(float),
+            "rssi": to_float("rssi"),
+            "latency_ms": to_float("latency", "latencyms"),
+            "jitter_ms": to_float("jitter", "jitterms"),
+            "tx_errors": to_float("txerrors", "txerr"),
+            "rx_errors": to_float("rxerrors", "rxerr"),
+        },
+        columns=BACKHAUL_COLUMNS,
+    )
+
+
+def parse_backhaul_csvs(
+    contents: Iterable[bytes], max_workers: Optional[int] = None
+) -> List[pd.DataFrame]:
+    """Parse a batch of backhaul CSV files in worker processes, in input order."""
+    return map_in_pool(parse_backhaul_csv, contents, max_workers=max_workers)
+
+
+def summarize_backhaul(samples: pd.DataFrame) -> Dict[str, Any]:
     """
     Build summary statistics and a heuristic "impairment_score" between 0 and 1.
+
+    Trends are columnar: each is a dict of equal-length lists keyed by field
+    (e.g. ``{"timestamp": [...], "modulation": [...]}``) rather than one dict
+    per sample.
     """
-    if not samples:
+    if samples.empty:
         return {
             "total_samples": 0,
             "impairment_score": 0.0,
-            "modulation_trend": [],
-            "rssi_trend": [],
-            "latency_jitter_trend": [],
+            "modulation_trend": {"timestamp": [], "modulation": []},
+            "rssi_trend": {"timestamp": [], "rssi": []},
+            "latency_jitter_trend": {"timestamp": [], "latency_ms": [], "jitter_ms": []},
             "error_summary": {"tx_errors": 0.0, "rx_errors": 0.0},
         }
 
-    modulation_trend = []
-    rssi_trend = []
-    latency_jitter_trend = []
-    total_tx_err = 0.0
-    total_rx_err = 0.0
-
-    low_mod_count = 0
-    high_latency_count = 0
-    high_jitter_count = 0
-
-    for s in samples:
-        modulation_trend.append({"timestamp": s.timestamp, "modulation": s.modulation})
-        rssi_trend.append({"timestamp": s.timestamp, "rssi": s.rssi})
-        latency_jitter_trend.append(
-            {"timestamp": s.timestamp, "latency_ms": s.latency_ms, "jitter_ms": s.jitter_ms}
-        )
-
-        total_tx_err += s.tx_errors
-        total_rx_err += s.rx_errors
-
-        if s.modulation < 4:  # heuristic: low modulation order indicates impairment
-            low_mod_count += 1
-        if s.latency_ms > 50:
-            high_latency_count += 1
-        if s.jitter_ms > 20:
-            high_jitter_count += 1
-
-    n = float(len(samples))
+    timestamps = samples["timestamp"].tolist()
+    modulation = samples["modulation"].to_numpy(dtype=np.float64)
+    rssi = samples["rssi"].to_numpy(dtype=np.float64)
+    latency = samples["latency_ms"].to_numpy(dtype=np.float64)
+    jitter = samples["jitter_ms"].to_numpy(dtype=np.float64)
+
+    # heuristic: low modulation order indicates impairment
     impairment_score = min(
         1.0,
-        (low_mod_count / n) * 0.4
-        + (high_latency_count / n) * 0.3
-        + (high_jitter_count / n) * 0.3,
+        float((modulation < 4).mean()) * 0.4
+        + float((latency > 50).mean()) * 0.3
+        + float((jitter > 20).mean()) * 0.3,
     )
 
     return {
-        "total_samples": len(samples),
+        "total_samples": len(timestamps),
         "impairment_score": impairment_score,
-        "modulation_trend": modulation_trend,
-        "rssi_trend": rssi_trend,
-        "latency_jitter_trend": latency_jitter_trend,
+        "modulation_trend": {"timestamp": timestamps, "modulation": modulation.tolist()},
+        "rssi_trend": {"timestamp": timestamps, "rssi": rssi.tolist()},
+        "latency_jitter_trend": {
+            "timestamp": timestamps,
+            "latency_ms": latency.tolist(),
+            "jitter_ms": jitter.tolist(),
+        },
         "error_summary": {
-            "tx_errors": total_tx_err,
-            "rx_errors": total_rx_err,
+            "tx_errors": float(samples["tx_errors"].to_numpy(dtype=np.float64).sum()),
+            "rx_errors": float(samples["rx_errors"].to_numpy(dtype=np.float64).sum()),
         },
     }
 
 
+def summarize_backhaul_file(content: bytes) -> Dict[str, Any]:
+    """Parse and summarize a backhaul CSV upload, cached by content digest (do not mutate)."""
+    return _SUMMARY_CACHE.get_or_compute(
+        content_digest(content), lambda: summarize_backhaul(parse_backhaul_csv(content))
+    )
@@ -0,0 +1,87 @@
+"""
+In-memory result caches for RAN-Copilot.
+
+Uploads and dashboard refreshes frequently resubmit identical inputs, so
+expensive summaries are memoised under a digest of their input bytes.
+Batches of uploads are parsed in worker processes via ``map_in_pool``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from threading import Lock
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def content_digest(*parts: bytes) -> bytes:
+    """Return a 128-bit BLAKE2b digest of the given byte strings."""
+    h = blake2b(digest_size=16)
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.digest()
+
+
+class DigestCache:
+    """
+    Bounded least-recently-used mapping of digests to computed results.
+
+    Values are returned as stored; callers must treat them as read-only or
+    copy them before mutating.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: bytes, fn: Callable[[], T]) -> T:
+        """Return the value stored under ``key``, storing ``fn()`` first on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = fn()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def map_in_pool(
+    fn: Callable[..., T], *iterables: Iterable[Any], max_workers: Optional[int] = None
+) -> List[T]:
+    """
+    ``list(map(fn, *iterables))`` with one worker process per item.
+
+    Results are returned in input order. A single item is handled in-process.
+    ``fn`` must be a module-level function, and scripts calling this must
+    guard their entry point with ``if __name__ == "__main__":`` on platforms
+    that spawn workers.
+    """
+    columns = [list(iterable) for iterable in iterables]
+    if len(columns[0]) <= 1:
+        return list(map(fn, *columns))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(fn, *columns))
@@ -0,0 +1,79 @@
+"""
+CSV helpers shared by the alarm, backhaul, and attach analyzers.
+
+Exports are read in one pass with the pandas C parser and then accessed
+column-wise, instead of building a normalised dict for every row.
+"""
+
+from __future__ import annotations
+
+import io
+import warnings
+from typing import Callable, Iterable, Optional
+
+import pandas as pd
+
+
+def normalise_header(name: object) -> str:
+    """Lower-case a CSV header and drop spaces/underscores ("Alarm_Id" -> "alarmid")."""
+    return str(name).strip().lower().replace(" ", "").replace("_", "")
+
+
+def read_csv_frame(content: bytes, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Read a CSV export into an all-string DataFrame with normalised column names.
+
+    Uses the pandas C parser so large exports are tokenised in native code
+    rather than row-by-row through ``csv.DictReader``. Missing cells become
+    empty strings; headers are normalised once with ``normalise_header``.
+
+    When ``columns`` (normalised names) is given, only matching columns are
+    materialised; the header filter runs once per column, not per row.
+    """
+    usecols = None
+    if columns is not None:
+        wanted = frozenset(columns)
+        usecols = lambda name: normalise_header(name) in wanted  # noqa: E731
+
+    try:
+        df = _read(content, usecols)
+        if usecols is not None and df.columns.empty:
+            # None of the known columns exist; read everything so the rows
+            # themselves are still reported
+            df = _read(content, None)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+    df.columns = [normalise_header(c) for c in df.columns]
+    # Later duplicates win, matching the previous dict-per-row behaviour
+    df = df.loc[:, ~df.columns.duplicated(keep="last")]
+    return df.fillna("")
+
+
+def coalesce(df: pd.DataFrame, *names: str) -> pd.Series:
+    """Return the first non-empty value across the given (normalised) columns."""
+    out = pd.Series("", index=df.index, dtype=object)
+    for name in reversed(names):
+        if name in df.columns:
+            col = df[name]
+            out = col.where(col != "", out)
+    return out
+
+
+def _read(content: bytes, usecols: Optional[Callable[[str], bool]]) -> pd.DataFrame:
+    with warnings.catch_warnings():
+        # index_col=False warns when rows carry a trailing comma; the extra
+        # empty field is exactly what should be dropped
+        warnings.simplefilter("ignore", pd.errors.ParserWarning)
+        return pd.read_csv(
+            io.BytesIO(content),
+            dtype=str,
+            keep_default_na=False,
+            skip_blank_lines=True,
+            on_bad_lines="skip",
+            encoding_errors="ignore",
+            engine="c",
+            # Trailing commas must not turn the first column into the index
+            index_col=False,
+            usecols=usecols,
+        )
@@ -8,9 +8,12 @@ in the RCA engine so that it can be reused by the multi-signal RCA engine.
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Any, Dict, List, Tuple
-import statistics
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._kpi_kernels import grouped_stats
 
 # Local copy of KPI thresholds to avoid circular import with engine.rca
 THRESHOLDS: Dict[str, Dict[str, Any]] = {
@@ -27,6 +30,31 @@ THRESHOLDS: Dict[str, Dict[str, Any]] = {
 }
 
 
+class Anomaly(NamedTuple):
+    """A KPI whose mean violates its threshold."""
+
+    kpi: str
+    type: str  # "below_threshold" | "above_threshold"
+    value: float
+    threshold: float
+    severity: str  # "high" | "medium"
+
+
+# (evidence, anomalies, kpi_by_site) as returned by summarize_kpis_df
+KpiSummary = Tuple[Dict[str, Dict[str, float]], List[Anomaly], Dict[str, Dict[str, List[float]]]]
+
+
+def kpi_frame(kpi_data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Convert raw KPI samples into a columnar frame (kpi, site, value).
+
+    Rows without a KPI name or value are dropped, missing sites become
+    "UNKNOWN" and values are float64.
+    """
+    kpis, sites, values = _kpi_columns(kpi_data)
+    return pd.DataFrame({"kpi": kpis, "site": sites, "value": values})
+
+
 def summarize_kpis(kpi_data: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, float]], List[Dict[str, Any]], Dict[str, Dict[str, List[float]]]]:
     """
     Build KPI evidence, anomalies, and per-site grouping from raw KPI samples.
@@ -36,77 +64,181 @@ def summarize_kpis(kpi_data: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str,
         anomalies: list of threshold violations with severities
         kpi_by_site: nested dict site -> kpi -> list[values]
     """
-    kpi_by_name = defaultdict(list)
-    kpi_by_site = defaultdict(lambda: defaultdict(list))
+    evidence, anomalies, kpi_by_site = _summarize(*_kpi_columns(kpi_data))
+    return evidence, [a._asdict() for a in anomalies], kpi_by_site
 
-    for entry in kpi_data:
-        kpi_name = entry.get("kpi")
-        site = entry.get("site", "UNKNOWN")
-        value = entry.get("value")
 
-        if kpi_name is None or value is None:
-            continue
+def summarize_kpis_df(df: pd.DataFrame) -> KpiSummary:
+    """
+    Same as ``summarize_kpis`` but for a frame already built by ``kpi_frame``,
+    with anomalies as ``Anomaly`` tuples rather than dicts.
+    """
+    return _summarize(*_frame_columns(df))
 
-        kpi_by_name[kpi_name].append(value)
-        kpi_by_site[site][kpi_name].append(value)
 
-    evidence: Dict[str, Dict[str, float]] = {}
-    anomalies: List[Dict[str, Any]] = []
+def summarize_kpis_by_site(df: pd.DataFrame) -> Dict[str, KpiSummary]:
+    """
+    Summarize a ``kpi_frame`` separately for every site in one pass.
 
-    for kpi_name, values in kpi_by_name.items():
-        if not values:
+    Statistics for all (site, KPI) pairs come from a single kernel call over
+    the flat value column. Each site's entry matches ``summarize_kpis_df``
+    on that site's rows alone; sites appear in order of first appearance.
+    """
+    return _summarize_by_site(*_frame_columns(df))
+
+
+def _kpi_columns(kpi_data: List[Dict[str, Any]]) -> Tuple[List[Any], List[Any], np.ndarray]:
+    """Split raw samples into kpi/site/value columns, applying the ``kpi_frame`` rules."""
+    kpis: List[Any] = []
+    sites: List[Any] = []
+    values: List[Any] = []
+    for row in kpi_data:
+        kpi_name = row.get("kpi")
+        value = row.get("value")
+        # x != x catches NaN, which pandas treats as missing too
+        if kpi_name is None or kpi_name != kpi_name or value is None or value != value:
             continue
+        site = row.get("site")
+        kpis.append(kpi_name)
+        sites.append("UNKNOWN" if site is None or site != site else site)
+        values.append(value)
+    return kpis, sites, np.asarray(values, dtype=np.float64)
 
-        stats = {
-            "mean": statistics.mean(values),
-            "min": min(values),
-            "max": max(values),
-            "count": len(values),
-        }
-
-        if len(values) > 1:
-            try:
-                stats["median"] = statistics.median(values)
-                stats["stdev"] = statistics.stdev(values) if len(values) > 1 else 0.0
-            except Exception:
-                stats["median"] = stats["mean"]
-                stats["stdev"] = 0.0
 
-        evidence[kpi_name] = stats
+def _frame_columns(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if df.empty:
+        return np.empty(0, dtype=object), np.empty(0, dtype=object), np.empty(0)
+    return (
+        df["kpi"].to_numpy(dtype=object),
+        df["site"].to_numpy(dtype=object),
+        df["value"].to_numpy(dtype=np.float64),
+    )
 
-        # Threshold-based anomalies
-        threshold = THRESHOLDS.get(kpi_name)
-        if not threshold:
-            continue
 
-        if "min" in threshold:
-            if stats["mean"] < threshold["min"]:
-                anomalies.append(
-                    {
-                        "kpi": kpi_name,
-                        "type": "below_threshold",
-                        "value": stats["mean"],
-                        "threshold": threshold["min"],
-                        "severity": "high"
-                        if stats["mean"] < threshold["min"] * 0.8
-                        else "medium",
-                    }
-                )
+def _summarize(kpis: Any, sites: Any, values: np.ndarray) -> KpiSummary:
+    if not len(values):
+        return {}, [], {}
+
+    kpi_codes, kpi_names = _factorize(kpis)
+    stats = grouped_stats(values, np.asarray(kpi_codes, dtype=np.int64), len(kpi_names))
+    evidence, anomalies = _evidence_and_anomalies(kpi_names, *stats)
+
+    pair_codes, site_names, pairs = _site_kpi_pairs(sites, kpi_codes)
+    return evidence, anomalies, _values_by_site(values, pair_codes, site_names, kpi_names, pairs)
+
+
+def _summarize_by_site(kpis: Any, sites: Any, values: np.ndarray) -> Dict[str, KpiSummary]:
+    if not len(values):
+        return {}
+
+    kpi_codes, kpi_names = _factorize(kpis)
+    pair_codes, site_names, pairs = _site_kpi_pairs(sites, kpi_codes)
+    stats = grouped_stats(values, pair_codes, len(pairs))
+    by_site = _values_by_site(values, pair_codes, site_names, kpi_names, pairs)
+
+    # Pair indices per site; pairs are in first-appearance order, so each
+    # site's KPIs are in the order they first appear in that site's rows
+    site_pairs: Dict[int, List[int]] = {}
+    for i, (site_code, _) in enumerate(pairs):
+        site_pairs.setdefault(site_code, []).append(i)
+
+    summaries: Dict[str, KpiSummary] = {}
+    for site_code, idx in site_pairs.items():
+        site = site_names[site_code]
+        evidence, anomalies = _evidence_and_anomalies(
+            [kpi_names[pairs[i][1]] for i in idx], *(col[idx] for col in stats)
+        )
+        summaries[site] = (evidence, anomalies, {site: by_site[site]})
+    return summaries
 
-        if "max" in threshold:
-            if stats["mean"] > threshold["max"]:
-                anomalies.append(
-                    {
-                        "kpi": kpi_name,
-                        "type": "above_threshold",
-                        "value": stats["mean"],
-                        "threshold": threshold["max"],
-                        "severity": "high"
-                        if stats["mean"] > threshold["max"] * 1.2
-                        else "medium",
-                    }
-                )
 
-    return evidence, anomalies, kpi_by_site
+def _factorize(keys: Iterable[Any]) -> Tuple[List[int], List[Any]]:
+    """Integer codes and unique keys, in order of first appearance."""
+    index: Dict[Any, int] = {}
+    codes = [index.setdefault(key, len(index)) for key in keys]
+    return codes, list(index)
 
 
+def _site_kpi_pairs(sites: Any, kpi_codes: List[int]) -> Tuple[np.ndarray, List[Any], List[Tuple[int, int]]]:
+    """
+    Factorize rows by (site, KPI).
+
+    Returns int64 pair codes per row, site names, and each pair as (site
+    code, KPI code); pairs are in order of first appearance.
+    """
+    site_codes, site_names = _factorize(sites)
+    pair_codes, pairs = _factorize(zip(site_codes, kpi_codes))
+    return np.asarray(pair_codes, dtype=np.int64), site_names, pairs
+
+
+def _evidence_and_anomalies(
+    kpi_names: List[Any],
+    count: np.ndarray,
+    mean: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    median: np.ndarray,
+    stdev: np.ndarray,
+) -> Tuple[Dict[str, Dict[str, float]], List[Anomaly]]:
+    """Turn per-KPI statistics arrays into evidence dicts and threshold anomalies."""
+    evidence: Dict[str, Dict[str, float]] = {}
+    anomalies: List[Anomaly] = []
+    for kpi_name, n, kpi_mean, kpi_min, kpi_max, kpi_median, kpi_stdev in zip(
+        kpi_names,
+        count.tolist(),
+        mean.tolist(),
+        lo.tolist(),
+        hi.tolist(),
+        median.tolist(),
+        stdev.tolist(),
+    ):
+        stats = {"mean": kpi_mean, "min": kpi_min, "max": kpi_max, "count": n}
+        if n >= 2:
+            stats["median"] = kpi_median
+            stats["stdev"] = kpi_stdev
+        evidence[kpi_name] = stats
+
+        # Threshold-based anomalies
+        limits = THRESHOLDS.get(kpi_name)
+        if limits is None:
+            continue
+        limit_min = limits.get("min")
+        if limit_min is not None and kpi_mean < limit_min:
+            anomalies.append(
+                Anomaly(
+                    kpi_name,
+                    "below_threshold",
+                    kpi_mean,
+                    float(limit_min),
+                    "high" if kpi_mean < limit_min * 0.8 else "medium",
+                )
+            )
+        limit_max = limits.get("max")
+        if limit_max is not None and kpi_mean > limit_max:
+            anomalies.append(
+                Anomaly(
+                    kpi_name,
+                    "above_threshold",
+                    kpi_mean,
+                    float(limit_max),
+                    "high" if kpi_mean > limit_max * 1.2 else "medium",
+                )
+            )
+
+    return evidence, anomalies
+
+
+def _values_by_site(
+    values: np.ndarray,
+    pair_codes: np.ndarray,
+    site_names: List[Any],
+    kpi_names: List[Any],
+    pairs: List[Tuple[int, int]],
+) -> Dict[str, Dict[str, List[float]]]:
+    # One stable sort makes every (site, KPI) series a contiguous run in
+    # original row order
+    runs = np.split(values[np.argsort(pair_codes, kind="stable")], np.cumsum(np.bincount(pair_codes))[:-1])
+    kpi_by_site: Dict[str, Dict[str, List[float]]] = {}
+    for (site_code, kpi_code), run in zip(pairs, runs):
+        kpi_by_site.setdefault(site_names[site_code], {})[kpi_names[kpi_code]] = run.tolist()
+    return kpi_by_site
@@ -0,0 +1,82 @@
+"""
+Bounded KPI history for always-on RCA.
+
+Instead of resubmitting an ever-growing KPI window, callers can feed new
+samples into a ``KpiState`` and pass the state to ``analyze_rca``. Only the
+most recent ``capacity`` samples of each (site, KPI) series are kept, so
+memory is O(capacity * series) regardless of how long the state lives.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .kpi_analyzer import kpi_frame
+
+
+class KpiRingBuffer:
+    """Most recent values of one (site, KPI) series, oldest first."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._values: Deque[float] = deque(maxlen=capacity)
+
+    def extend(self, values: List[float]) -> None:
+        self._values.extend(values)
+
+    def values(self) -> List[float]:
+        return list(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class KpiState:
+    """
+    Per-(site, KPI) ring buffers of recent samples.
+
+    ``update`` accepts the same records as ``analyze_rca`` (kpi/site/value
+    dicts); ``frame`` returns the retained samples in the ``kpi_frame``
+    layout, with series in order of first appearance.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.capacity = capacity
+        self._buffers: Dict[Tuple[str, str], KpiRingBuffer] = {}
+
+    def update(self, kpi_data: List[Dict[str, Any]]) -> None:
+        """Append new KPI samples, evicting the oldest beyond ``capacity``."""
+        df = kpi_frame(kpi_data)
+        for key, values in df.groupby(["site", "kpi"], sort=False)["value"]:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = KpiRingBuffer(self.capacity)
+            buffer.extend(values.tolist())
+
+    def frame(self) -> pd.DataFrame:
+        """Retained samples as a kpi/site/value frame."""
+        kpis, sites, values = self.columns()
+        return pd.DataFrame({"kpi": kpis, "site": sites, "value": values})
+
+    def columns(self) -> Tuple[List[str], List[str], np.ndarray]:
+        """Retained samples as parallel kpi/site/value columns, like ``frame``."""
+        kpis: List[str] = []
+        sites: List[str] = []
+        values: List[float] = []
+        for (site, kpi_name), buffer in self._buffers.items():
+            n = len(buffer)
+            kpis.extend([kpi_name] * n)
+            sites.extend([site] * n)
+            values.extend(buffer.values())
+        return kpis, sites, np.asarray(values, dtype=np.float64)
+
+    def clear(self) -> None:
+        self._buffers.clear()
+
+    def __len__(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
@@ -2,11 +2,14 @@
 LTE Band 41 Root Cause Analysis Engine
 Implements RCA logic for detecting network anomalies and performance issues.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from collections import defaultdict
 import statistics
 
+from .kpi_analyzer import Anomaly
+from .kpi_state import KpiState
 from .rca_engine import analyze_rca as _multi_signal_analyze_rca  # type: ignore
+from .rca_engine import analyze_rca_many  # type: ignore
 
 
 # RCA Thresholds (LTE B41 specific)
@@ -25,7 +28,7 @@ THRESHOLDS = {
 
 
 def analyze_rca(
-    kpi_data: List[Dict[str, Any]],
+    kpi_data: Union[List[Dict[str, Any]], KpiState],
     alarm_summary: Optional[Dict[str, Any]] = None,
     backhaul_summary: Optional[Dict[str, Any]] = None,
     attach_summary: Optional[Dict[str, Any]] = None,
@@ -34,7 +37,8 @@ def analyze_rca(
     Perform Root Cause Analysis on KPI data.
     
     Args:
-        kpi_data: List of KPI measurements from parser
+        kpi_data: List of KPI measurements from parser, or a
+            ``engine.kpi_state.KpiState`` with recent streaming samples
     
     Returns:
         Dictionary with:
@@ -58,6 +62,9 @@ def analyze_rca(
     return _multi_signal_analyze_rca(kpi_data, alarm_summary, backhaul_summary, attach_summary)
 
 
+analyze_rca.cache_clear = _multi_signal_analyze_rca.cache_clear  # type: ignore[attr-defined]
+
+
 def _legacy_analyze_rca(kpi_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Original KPI-only RCA implementation kept for reference and potential
@@ -114,23 +121,23 @@ def _legacy_analyze_rca(kpi_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         if threshold:
             if "min" in threshold:
                 if stats["mean"] < threshold["min"]:
-                    anomalies.append({
-                        "kpi": kpi_name,
-                        "type": "below_threshold",
-                        "value": stats["mean"],
-                        "threshold": threshold["min"],
-                        "severity": "high" if stats["mean"] < threshold["min"] * 0.8 else "medium"
-                    })
+                    anomalies.append(Anomaly(
+                        kpi=kpi_name,
+                        type="below_threshold",
+                        value=stats["mean"],
+                        threshold=threshold["min"],
+                        severity="high" if stats["mean"] < threshold["min"] * 0.8 else "medium"
+                    ))
             
             if "max" in threshold:
                 if stats["mean"] > threshold["max"]:
-                    anomalies.append({
-                        "kpi": kpi_name,
-                        "type": "above_threshold",
-                        "value": stats["mean"],
-                        "threshold": threshold["max"],
-                        "severity": "high" if stats["mean"] > threshold["max"] * 1.2 else "medium"
-                    })
+                    anomalies.append(Anomaly(
+                        kpi=kpi_name,
+                        type="above_threshold",
+                        value=stats["mean"],
+                        threshold=threshold["max"],
+                        severity="high" if stats["mean"] > threshold["max"] * 1.2 else "medium"
+                    ))
     
     # Determine root cause
     root_cause, severity = determine_root_cause(evidence, anomalies, kpi_by_site)
@@ -142,14 +149,14 @@ def _legacy_analyze_rca(kpi_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         "root_cause": root_cause,
         "severity": severity,
         "evidence": evidence,
-        "anomalies": anomalies,
+        "anomalies": [a._asdict() for a in anomalies],
         "recommendations": recommendations
     }
 
 
 def determine_root_cause(
     evidence: Dict[str, Dict[str, float]],
-    anomalies: List[Dict[str, Any]],
+    anomalies: List[Anomaly],
     kpi_by_site: Dict[str, Dict[str, List[float]]]
 ) -> tuple[str, str]:
     """
@@ -162,8 +169,8 @@ def determine_root_cause(
         return ("Normal Operation", "low")
     
     # Count anomalies by type
-    high_severity_count = sum(1 for a in anomalies if a.get("severity") == "high")
-    medium_severity_count = sum(1 for a in anomalies if a.get("severity") == "medium")
+    high_severity_count = sum(1 for a in anomalies if a.severity == "high")
+    medium_severity_count = sum(1 for a in anomalies if a.severity == "medium")
     
     # Determine overall severity
     if high_severity_count > 0:
@@ -176,13 +183,13 @@ def determine_root_cause(
         severity = "low"
     
     # Root cause classification logic
-    rrc_anomaly = any(a["kpi"] == "RRC_Setup_Success_Rate" for a in anomalies)
-    erab_anomaly = any(a["kpi"] == "ERAB_Setup_Success_Rate" for a in anomalies)
-    s1_anomaly = any(a["kpi"] == "S1_Setup_Failure_Rate" for a in anomalies)
-    prb_anomaly = any("PRB" in a["kpi"] for a in anomalies)
-    sinr_anomaly = any("SINR" in a["kpi"] for a in anomalies)
-    bler_anomaly = any("BLER" in a["kpi"] for a in anomalies)
-    paging_anomaly = any("Paging" in a["kpi"] for a in anomalies)
+    rrc_anomaly = any(a.kpi == "RRC_Setup_Success_Rate" for a in anomalies)
+    erab_anomaly = any(a.kpi == "ERAB_Setup_Success_Rate" for a in anomalies)
+    s1_anomaly = any(a.kpi == "S1_Setup_Failure_Rate" for a in anomalies)
+    prb_anomaly = any("PRB" in a.kpi for a in anomalies)
+    sinr_anomaly = any("SINR" in a.kpi for a in anomalies)
+    bler_anomaly = any("BLER" in a.kpi for a in anomalies)
+    paging_anomaly = any("Paging" in a.kpi for a in anomalies)
     
     # Transport/TIMING faults
     if s1_anomaly and (rrc_anomaly or erab_anomaly):
@@ -231,7 +238,7 @@ def determine_root_cause(
 def generate_recommendations(
     root_cause: str,
     evidence: Dict[str, Dict[str, float]],
-    anomalies: List[Dict[str, Any]]
+    anomalies: List[Anomaly]
 ) -> List[str]:
     """Generate actionable recommendations based on root cause"""
     recommendations = []
@@ -315,13 +322,13 @@ def generate_recommendations(
     
     # Add specific recommendations based on anomalies
     for anomaly in anomalies:
-        kpi = anomaly["kpi"]
-        if "RRC" in kpi and anomaly.get("severity") == "high":
+        kpi = anomaly.kpi
+        if "RRC" in kpi and anomaly.severity == "high":
             recommendations.append("Immediate attention required for RRC setup failures")
-        if "ERAB" in kpi and anomaly.get("severity") == "high":
+        if "ERAB" in kpi and anomaly.severity == "high":
             recommendations.append("Immediate attention required for ERAB setup failures")
         if "S1" in kpi:
             recommendations.append("Investigate S1 interface connectivity issues")
     
-    return list(set(recommendations))  # Remove duplicates
+    return list(dict.fromkeys(recommendations))  # Remove duplicates, keep order
 
@@ -12,14 +12,71 @@ into a single ranked root-cause assessment and recommendation list.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+import copy
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Final, List, Optional, Tuple, Union
 
-from .kpi_analyzer import summarize_kpis
+import numpy as np
+
+from .cache import DigestCache, content_digest
+from .kpi_analyzer import Anomaly, _kpi_columns, _summarize, _summarize_by_site
+from .kpi_state import KpiState
 from . import rca as legacy_rca
 
+# Dashboards re-run RCA on the same window many times; results are keyed by
+# a digest of all four inputs.
+_RCA_CACHE = DigestCache(maxsize=512)
+
+# Severity labels shared with the legacy engine, and their escalation order
+_SEV_LOW: Final = sys.intern("low")
+_SEV_MED: Final = sys.intern("medium")
+_SEV_HIGH: Final = sys.intern("high")
+_SEVERITY_SCORE: Final[Dict[str, int]] = {_SEV_LOW: 1, _SEV_MED: 2, _SEV_HIGH: 3}
+_SEVERITY_LABELS: Final = (_SEV_LOW, _SEV_LOW, _SEV_MED, _SEV_HIGH)  # indexed by score
+
+# Fixed recommendation sentences added by _extra_recommendations
+_REC_REVIEW_ALARMS: Final = "Review active CRITICAL/MAJOR alarms in ENM for impacted MOs."
+_REC_ALARM_TIMING: Final = "Verify whether alarms coincide with KPI degradation periods."
+_REC_BACKHAUL_MODULATION: Final = (
+    "Investigate microwave/fiber backhaul modulation drops and high jitter."
+)
+_REC_BACKHAUL_ERRORS: Final = (
+    "Correlate backhaul RSSI and error counters with BLER and ERAB failures."
+)
+
+# Result for calls without KPI data; hand out copies via _no_data_result()
+_NO_DATA_RESULT: Final[Dict[str, Any]] = {
+    "root_cause": "No Data",
+    "severity": _SEV_LOW,
+    "evidence": {},
+    "anomalies": [],
+    "recommendations": ("No KPI data available for analysis",),
+}
+
+# KPIs whose anomalies point at a transport/timing fault when alarms are active
+_TRANSPORT_KPIS = frozenset({"S1_Setup_Failure_Rate"})
+
+# Dominant attach failure category -> root cause / follow-up recommendations
+_ATTACH_ROOT_CAUSE: Dict[str, str] = {
+    "APN_QCI": "CPE Attach Failures - APN/QCI Configuration",
+    "TAC": "CPE Attach Failures - TAC / Mobility Configuration",
+    "RF": "CPE Attach Failures - RF / Coverage",
+    "Congestion": "CPE Attach Failures - Congestion Driven",
+}
+_ATTACH_RECS: Dict[str, Tuple[str, ...]] = {
+    "APN_QCI": ("Check APN, QCI, and bearer configuration for impacted IMSIs and APNs.",),
+    "TAC": ("Verify TAC assignment and mobility configuration for affected cells.",),
+    "RF": ("Check RF coverage, SINR, and interference around sites with high attach failures.",),
+    "Congestion": (
+        "Correlate attach failures with congestion indicators (PRB utilization, throughput).",
+    ),
+}
+
 
 def analyze_rca(
-    kpi_data: List[Dict[str, Any]],
+    kpi_data: Union[List[Dict[str, Any]], KpiState],
     alarm_summary: Optional[Dict[str, Any]] = None,
     backhaul_summary: Optional[Dict[str, Any]] = None,
     attach_summary: Optional[Dict[str, Any]] = None,
@@ -30,26 +87,160 @@ def analyze_rca(
     This function is intentionally backward compatible with the previous
     KPI-only RCA: when no additional summaries are provided it behaves like
     the original engine.
+
+    ``kpi_data`` is either a full batch of KPI records or a ``KpiState``
+    holding the recent samples of a streaming feed.
+
+    Batch results are memoised by input fingerprint; each call returns its
+    own copy. Use ``analyze_rca.cache_clear()`` to drop cached results.
     """
     if not kpi_data:
-        return {
-            "root_cause": "No Data",
-            "severity": "low",
-            "evidence": {},
-            "anomalies": [],
-            "recommendations": ["No KPI data available for analysis"],
-        }
-
-    evidence, anomalies, kpi_by_site = summarize_kpis(kpi_data)
-
-    # Start with legacy KPI-based classification
-    base_root_cause, base_severity = legacy_rca.determine_root_cause(
-        evidence, anomalies, kpi_by_site
+        # Common for polled sites without data yet; skip hashing and the cache
+        return _no_data_result()
+
+    fast_override = os.getenv("RCA_FAST_OVERRIDE", "0") == "1"
+
+    if isinstance(kpi_data, KpiState):
+        # The state changes between calls, so its results are not cached
+        evidence, anomalies, kpi_by_site = _summarize(*kpi_data.columns())
+        return _rca_from_kpi_summary(
+            evidence,
+            anomalies,
+            kpi_by_site,
+            alarm_summary,
+            backhaul_summary,
+            attach_summary,
+            fast_override,
+        )
+
+    kpis, sites, values = _kpi_columns(kpi_data)
+    key = _fingerprint(
+        kpis,
+        sites,
+        values,
+        _signal_fields(alarm_summary, backhaul_summary, attach_summary),
+        fast_override,
     )
-    recommendations = legacy_rca.generate_recommendations(
-        base_root_cause, evidence, anomalies
+    result = _RCA_CACHE.get(key)
+    if result is None:
+        evidence, anomalies, kpi_by_site = _summarize(kpis, sites, values)
+        result = _rca_from_kpi_summary(
+            evidence,
+            anomalies,
+            kpi_by_site,
+            alarm_summary,
+            backhaul_summary,
+            attach_summary,
+            fast_override,
+        )
+        _RCA_CACHE.put(key, result)
+    return copy.deepcopy(result)
+
+
+analyze_rca.cache_clear = _RCA_CACHE.clear  # type: ignore[attr-defined]
+
+
+def _no_data_result() -> Dict[str, Any]:
+    """Fresh copy of _NO_DATA_RESULT with mutable containers."""
+    return {
+        **_NO_DATA_RESULT,
+        "evidence": {},
+        "anomalies": [],
+        "recommendations": list(_NO_DATA_RESULT["recommendations"]),
+    }
+
+
+def _fingerprint(kpis: List[Any], sites: List[Any], values: np.ndarray, *fields: Any) -> bytes:
+    """
+    Digest of parsed KPI columns plus scalar fields. ``repr`` keeps None,
+    NaN and +/-inf apart, which a JSON encoding would all render as null.
+    """
+    return content_digest(
+        repr(kpis).encode(), repr(sites).encode(), values.tobytes(), repr(fields).encode()
     )
 
+
+def _signal_fields(
+    alarm_summary: Optional[Dict[str, Any]],
+    backhaul_summary: Optional[Dict[str, Any]],
+    attach_summary: Optional[Dict[str, Any]],
+) -> List[Any]:
+    """
+    The summary fields RCA actually reads, for the cache key. Summaries also
+    carry per-sample trends and samples that would make hashing cost more
+    than the analysis itself.
+    """
+    by_severity = (alarm_summary or {}).get("by_severity") or {}
+    return [
+        bool(alarm_summary) and alarm_summary.get("total_count", 0),
+        by_severity.get("CRITICAL"),
+        by_severity.get("MAJOR"),
+        bool(backhaul_summary) and backhaul_summary.get("impairment_score", 0),
+        bool(attach_summary) and attach_summary.get("overall_attach_success_rate"),
+        bool(attach_summary) and attach_summary.get("dominant_failure_category"),
+    ]
+
+
+def analyze_rca_many(
+    kpi_data: List[Dict[str, Any]],
+    alarm_by_site: Optional[Dict[str, Dict[str, Any]]] = None,
+    backhaul_by_site: Optional[Dict[str, Dict[str, Any]]] = None,
+    attach_by_site: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run RCA separately for every site in ``kpi_data``.
+
+    KPI statistics for all sites are computed in one vectorized pass; only
+    the signal fusion runs per site. Each value has the same schema as
+    ``analyze_rca`` on that site's rows with the site's alarm/backhaul/attach
+    summaries (looked up by site name). Sites without valid KPI rows are
+    omitted. Results are not cached.
+    """
+    alarm_by_site = alarm_by_site or {}
+    backhaul_by_site = backhaul_by_site or {}
+    attach_by_site = attach_by_site or {}
+    fast_override = os.getenv("RCA_FAST_OVERRIDE", "0") == "1"
+
+    return {
+        site: _rca_from_kpi_summary(
+            evidence,
+            anomalies,
+            kpi_by_site,
+            alarm_by_site.get(site),
+            backhaul_by_site.get(site),
+            attach_by_site.get(site),
+            fast_override,
+        )
+        for site, (evidence, anomalies, kpi_by_site) in _summarize_by_site(
+            *_kpi_columns(kpi_data)
+        ).items()
+    }
+
+
+def _rca_from_kpi_summary(
+    evidence: Dict[str, Dict[str, float]],
+    anomalies: List[Anomaly],
+    kpi_by_site: Dict[str, Dict[str, List[float]]],
+    alarm_summary: Optional[Dict[str, Any]],
+    backhaul_summary: Optional[Dict[str, Any]],
+    attach_summary: Optional[Dict[str, Any]],
+    fast_override: bool,
+) -> Dict[str, Any]:
+    if fast_override and _attach_override_certain(attach_summary):
+        # The attach override decides both root cause and severity, so the
+        # legacy classification cannot change the outcome; skip it (and its
+        # KPI-derived recommendations).
+        base_root_cause, base_severity = "Normal Operation", _SEV_LOW
+        recommendations: List[str] = []
+    else:
+        # Start with legacy KPI-based classification
+        base_root_cause, base_severity = legacy_rca.determine_root_cause(
+            evidence, anomalies, kpi_by_site
+        )
+        recommendations = legacy_rca.generate_recommendations(
+            base_root_cause, evidence, anomalies
+        )
+
     # Enrich with alarms / backhaul / attach signals
     root_cause, severity = _combine_with_additional_signals(
         base_root_cause,
@@ -69,22 +260,35 @@ def analyze_rca(
         )
     )
 
-    # Deduplicate recommendations
-    recommendations = sorted(set(recommendations))
+    # Deduplicate recommendations, keeping KPI -> alarm -> backhaul -> attach order
+    recommendations = list(dict.fromkeys(recommendations))
 
     return {
         "root_cause": root_cause,
         "severity": severity,
         "evidence": evidence,
-        "anomalies": anomalies,
+        "anomalies": [a._asdict() for a in anomalies],
         "recommendations": recommendations,
     }
 
 
+def _attach_override_certain(attach_summary: Optional[Dict[str, Any]]) -> bool:
+    """
+    True when the attach context alone fixes the RCA outcome (a known dominant
+    failure category with success below 95%), whatever the KPI classification.
+    """
+    if not attach_summary or attach_summary.get("overall_attach_success_rate") is None:
+        return False
+    return (
+        attach_summary["overall_attach_success_rate"] < 95.0
+        and attach_summary.get("dominant_failure_category") in _ATTACH_ROOT_CAUSE
+    )
+
+
 def _combine_with_additional_signals(
     base_root_cause: str,
     base_severity: str,
-    anomalies: List[Dict[str, Any]],
+    anomalies: List[Anomaly],
     alarm_summary: Optional[Dict[str, Any]] = None,
     backhaul_summary: Optional[Dict[str, Any]] = None,
     attach_summary: Optional[Dict[str, Any]] = None,
@@ -92,7 +296,7 @@ def _combine_with_additional_signals(
     """
     Heuristic fusion of KPI-based RCA with alarms/backhaul/attach context.
     """
-    severity_score = {"low": 1, "medium": 2, "high": 3}.get(base_severity, 1)
+    severity_score = _SEVERITY_SCORE.get(base_severity, 1)
 
     root_cause = base_root_cause
 
@@ -101,8 +305,9 @@ def _combine_with_additional_signals(
         by_sev = alarm_summary.get("by_severity", {})
         crit_maj = by_sev.get("CRITICAL", 0) + by_sev.get("MAJOR", 0)
         if crit_maj > 0:
+            anomaly_kpis = frozenset(a.kpi for a in anomalies)
             # If there are transport/timing KPI anomalies, strongly bias toward a transport fault
-            if any(a["kpi"] in ("S1_Setup_Failure_Rate",) for a in anomalies):
+            if _TRANSPORT_KPIS & anomaly_kpis:
                 root_cause = "Transport/TIMING Fault (Alarms corroborated)"
                 severity_score = max(severity_score, 3)
             else:
@@ -125,63 +330,62 @@ def _combine_with_additional_signals(
     if attach_summary and attach_summary.get("overall_attach_success_rate") is not None:
         success = attach_summary["overall_attach_success_rate"]
         if success < 95.0:
-            if attach_summary.get("dominant_failure_category") == "APN_QCI":
-                root_cause = "CPE Attach Failures - APN/QCI Configuration"
-            elif attach_summary.get("dominant_failure_category") == "TAC":
-                root_cause = "CPE Attach Failures - TAC / Mobility Configuration"
-            elif attach_summary.get("dominant_failure_category") == "RF":
-                root_cause = "CPE Attach Failures - RF / Coverage"
-            elif attach_summary.get("dominant_failure_category") == "Congestion":
-                root_cause = "CPE Attach Failures - Congestion Driven"
+            root_cause = _ATTACH_ROOT_CAUSE.get(
+                attach_summary.get("dominant_failure_category"), root_cause
+            )
             severity_score = max(severity_score, 3)
 
     # Map numeric severity score back to label
-    severity = "low"
-    if severity_score >= 3:
-        severity = "high"
-    elif severity_score == 2:
-        severity = "medium"
-
-    return root_cause, severity
+    return root_cause, _SEVERITY_LABELS[min(severity_score, 3)]
 
 
 def _extra_recommendations(
     alarm_summary: Optional[Dict[str, Any]] = None,
     backhaul_summary: Optional[Dict[str, Any]] = None,
     attach_summary: Optional[Dict[str, Any]] = None,
-) -> List[str]:
-    recs: List[str] = []
-
-    if alarm_summary and alarm_summary.get("total_count", 0) > 0:
-        recs.append("Review active CRITICAL/MAJOR alarms in ENM for impacted MOs.")
-        recs.append("Verify whether alarms coincide with KPI degradation periods.")
-
-    if backhaul_summary and backhaul_summary.get("impairment_score", 0) > 0.5:
-        recs.append("Investigate microwave/fiber backhaul modulation drops and high jitter.")
-        recs.append("Correlate backhaul RSSI and error counters with BLER and ERAB failures.")
+) -> Tuple[str, ...]:
+    """
+    Reduce the summaries to the few scalars the recommendations depend on and
+    look them up in the cached builder.
+    """
+    has_alarms = bool(alarm_summary) and alarm_summary.get("total_count", 0) > 0
+    backhaul_impaired = (
+        bool(backhaul_summary) and backhaul_summary.get("impairment_score", 0) > 0.5
+    )
 
+    attach_success: Optional[float] = None
+    dominant: Optional[str] = None
     if attach_summary and attach_summary.get("overall_attach_success_rate") is not None:
         success = attach_summary["overall_attach_success_rate"]
         if success < 95.0:
-            recs.append(
-                f"Investigate attach failures; overall attach success rate is {success:.1f}%."
-            )
+            # Only one decimal is reported, so nearby rates share a cache entry
+            attach_success = round(success, 1)
             dominant = attach_summary.get("dominant_failure_category")
-            if dominant == "APN_QCI":
-                recs.append(
-                    "Check APN, QCI, and bearer configuration for impacted IMSIs and APNs."
-                )
-            elif dominant == "TAC":
-                recs.append("Verify TAC assignment and mobility configuration for affected cells.")
-            elif dominant == "RF":
-                recs.append(
-                    "Check RF coverage, SINR, and interference around sites with high attach failures."
-                )
-            elif dominant == "Congestion":
-                recs.append(
-                    "Correlate attach failures with congestion indicators (PRB utilization, throughput)."
-                )
-
-    return recs
 
+    return _extra_recommendations_for(has_alarms, backhaul_impaired, attach_success, dominant)
+
+
+@lru_cache(maxsize=1024)
+def _extra_recommendations_for(
+    has_alarms: bool,
+    backhaul_impaired: bool,
+    attach_success: Optional[float],
+    dominant: Optional[str],
+) -> Tuple[str, ...]:
+    recs: List[str] = []
+
+    if has_alarms:
+        recs.append(_REC_REVIEW_ALARMS)
+        recs.append(_REC_ALARM_TIMING)
+
+    if backhaul_impaired:
+        recs.append(_REC_BACKHAUL_MODULATION)
+        recs.append(_REC_BACKHAUL_ERRORS)
+
+    if attach_success is not None:
+        recs.append(
+            f"Investigate attach failures; overall attach success rate is {attach_success:.1f}%."
+        )
+        recs.extend(_ATTACH_RECS.get(dominant, ()))
 
+    return tuple(recs)